@@ -5,18 +5,83 @@ author_url: https://anvcore.com
 github: https://github.com/anvme/
 github_repo: https://github.com/anvme/openwebui-live_currency_rate
 version: 0.1.1
-requirements: requests, packaging
+requirements: aiohttp, orjson
 description:
     Tool to get live currency rates and convert between fiat and cryptocurrencies.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
-import requests
-import json
+from typing import Optional, Dict, Any, List, Tuple
+import asyncio
+import heapq
+import aiohttp
+import orjson
+import os
+import re
 import time
-from datetime import datetime, timedelta
-from packaging import version
+from datetime import datetime
+from types import MappingProxyType
+
+_VERSION_RE = re.compile(r"\d+")
+
+
+def _parse_version(value: str) -> Tuple[int, ...]:
+    """Turn a version string like '0.1.1' into a comparable tuple"""
+    return tuple(int(part) for part in _VERSION_RE.findall(value))
+
+
+# Currencies quoted as "1 crypto = X USD" by the API
+_CRYPTO = frozenset({"BTC", "ETH", "SOL"})
+
+# Friendly names for currency codes
+_CURRENCY_NAMES = MappingProxyType(
+    {
+        "USD": "United States Dollar ($)",
+        "EUR": "Euro (€)",
+        "JPY": "Japanese Yen (¥)",
+        "GBP": "British Pound (£)",
+        "CNY": "Chinese Yuan (¥)",
+        "AUD": "Australian Dollar (A$)",
+        "CAD": "Canadian Dollar (C$)",
+        "CHF": "Swiss Franc (Fr)",
+        "HKD": "Hong Kong Dollar (HK$)",
+        "SGD": "Singapore Dollar (S$)",
+        "NZD": "New Zealand Dollar (NZ$)",
+        "SEK": "Swedish Krona (kr)",
+        "KRW": "South Korean Won (₩)",
+        "NOK": "Norwegian Krone (kr)",
+        "INR": "Indian Rupee (₹)",
+        "MXN": "Mexican Peso ($)",
+        "BRL": "Brazilian Real (R$)",
+        "ZAR": "South African Rand (R)",
+        "TRY": "Turkish Lira (₺)",
+        "DKK": "Danish Krone (kr)",
+        "PLN": "Polish Zloty (zł)",
+        "CZK": "Czech Koruna (Kč)",
+        "ILS": "Israeli New Shekel (₪)",
+        "THB": "Thai Baht (฿)",
+        "MYR": "Malaysian Ringgit (RM)",
+        "PHP": "Philippine Peso (₱)",
+        "IDR": "Indonesian Rupiah (Rp)",
+        "HUF": "Hungarian Forint (Ft)",
+        "RON": "Romanian Leu (lei)",
+        "BGN": "Bulgarian Lev (лв)",
+        "ISK": "Icelandic Króna (kr)",
+        "BTC": "Bitcoin (BTC)",
+        "SOL": "Solana (SOL)",
+        "ETH": "Ethereum (ETH)",
+    }
+)
+
+# Amount formatters: crypto, and fiat indexed by size (<1, <100, >=100)
+_CRYPTO_FMT = "{:,.8f}".format
+_FIAT_FMT = ("{:,.6f}".format, "{:,.4f}".format, "{:,.2f}".format)
+
+# Pre-rendered, sorted list_currencies rows for the crypto section
+_CRYPTO_ROWS = tuple(
+    (code, f"• {code} - {_CURRENCY_NAMES.get(code, code)}\n")
+    for code in sorted(_CRYPTO)
+)
 
 
 class Tools:
@@ -44,18 +109,69 @@ class Tools:
 
     def __init__(self):
         self.valves = self.Valves()
-        self.cache: Dict[str, Any] = {"data": None, "timestamp": 0}
+        self.cache: Dict[str, Any] = {
+            "data": None,
+            "timestamp": 0,
+            "update_time": "",
+            "listing": None,
+            "url": None,
+            "etag": None,
+            "last_modified": None,
+        }
+        self._state_dirty = False
         self.update_state = self._load_state()
+        # Staleness checks use the monotonic clock, last_check is kept for the file
+        seconds_since_check = (
+            datetime.now() - self.update_state["last_check"]
+        ).total_seconds()
+        self._last_check_monotonic = time.monotonic() - seconds_since_check
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._current_v = _parse_version(self.CURRENT_VERSION)
+        self._notif_cache = (None, "")
+        github_url = f"https://github.com/{self.GITHUB_USER}/{self.GITHUB_REPO}"
+        ext_url = f"https://openwebui.com/{self.EXT_PATH}"
+        self._notif_tmpl = (
+            f"**🔔 {self.EXT_TITLE} Update Available!**\nVersion {{v}} is now available.\n"
+            f"Current version: {self.CURRENT_VERSION}\n"
+            f"📦 [GitHub]({github_url}) | 🔘 [OpenWebUI]({ext_url}) | 🗒️ [Release Notes]({github_url}/releases)\n"
+        )
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Task] = None
+        self._update_task: Optional[asyncio.Task] = None
+        self._last_refresh_attempt = 0.0
+        self._min_refresh_interval = 30
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            # Keep-alive pool so repeated calls reuse the TCP/TLS connection
+            connector = aiohttp.TCPConnector(
+                limit=4, limit_per_host=4, keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def __del__(self):
+        session = getattr(self, "_session", None)
+        if session is None or session.closed:
+            return
+        try:
+            asyncio.get_running_loop().create_task(session.close())
+        except RuntimeError:
+            try:
+                asyncio.run(session.close())
+            except Exception:
+                pass
 
     def _load_state(self) -> dict:
         try:
-            with open(self.DATA_FILE, "r") as f:
-                data = json.load(f)
+            with open(self.DATA_FILE, "rb") as f:
+                data = orjson.loads(f.read())
                 data["last_check"] = datetime.fromisoformat(
                     data.get("last_check", "2024-01-01")
                 )
                 return data
-        except (FileNotFoundError, json.JSONDecodeError, ValueError):
+        except (FileNotFoundError, orjson.JSONDecodeError, ValueError):
             return {
                 "last_check": datetime(2024, 1, 1),
                 "latest_version": None,
@@ -64,56 +180,71 @@ class Tools:
             }
 
     def _save_state(self):
+        if not self._state_dirty:
+            return
         try:
             data = self.update_state.copy()
             data["last_check"] = data["last_check"].isoformat()
-            with open(self.DATA_FILE, "w") as f:
-                json.dump(data, f)
+            # Write to a temp file and swap it in so a crash can't truncate state
+            tmp_file = self.DATA_FILE + ".tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(orjson.dumps(data))
+            os.replace(tmp_file, self.DATA_FILE)
+            self._state_dirty = False
         except (OSError, IOError):
             pass
 
-    def _check_github_release(self):
+    async def _check_github_release(self):
         try:
             url = f"https://api.github.com/repos/{self.GITHUB_USER}/{self.GITHUB_REPO}/releases/latest"
-            response = requests.get(url, timeout=5)
+            async with self._get_session().get(
+                url, timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                if response.status != 200:
+                    return
+                data = orjson.loads(await response.read())
 
-            if response.status_code == 200:
-                data = response.json()
-                new_version = data.get("tag_name", "").lstrip("v")
+            new_version = data.get("tag_name", "").lstrip("v")
 
-                version_changed = self.update_state["latest_version"] != new_version
+            version_changed = self.update_state["latest_version"] != new_version
 
-                self.update_state["latest_version"] = new_version
-                self.update_state["latest_url"] = data.get("html_url", "")
+            self.update_state["latest_version"] = new_version
+            self.update_state["latest_url"] = data.get("html_url", "")
 
-                if version_changed:
-                    self.update_state["has_shown_notification"] = False
+            if version_changed:
+                self.update_state["has_shown_notification"] = False
 
-        except (requests.RequestException, json.JSONDecodeError, KeyError):
+        except (
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+            orjson.JSONDecodeError,
+            KeyError,
+        ):
             pass
         finally:
             self.update_state["last_check"] = datetime.now()
+            self._last_check_monotonic = time.monotonic()
+            self._state_dirty = True
             self._save_state()
 
     def _get_update_notification(self) -> str:
-        if not self.update_state["latest_version"]:
+        latest = self.update_state["latest_version"]
+        if not latest:
             return ""
 
+        # Rendered text only changes when a new release is seen
+        if self._notif_cache[0] == latest:
+            return self._notif_cache[1]
+
+        notification = ""
         try:
-            if version.parse(self.update_state["latest_version"]) > version.parse(
-                self.CURRENT_VERSION
-            ):
-                github_url = f"https://github.com/{self.GITHUB_USER}/{self.GITHUB_REPO}"
-                ext_url = f"https://openwebui.com/{self.EXT_PATH}"
-                return (
-                    f"**🔔 {self.EXT_TITLE} Update Available!**\nVersion {self.update_state['latest_version']} is now available.\n"
-                    f"Current version: {self.CURRENT_VERSION}\n"
-                    f"📦 [GitHub]({github_url}) | 🔘 [OpenWebUI]({ext_url}) | 🗒️ [Release Notes]({github_url}/releases)\n"
-                )
+            if _parse_version(latest) > self._current_v:
+                notification = self._notif_tmpl.format(v=latest)
         except (ValueError, TypeError):
             pass
 
-        return ""
+        self._notif_cache = (latest, notification)
+        return notification
 
     def _should_check_for_updates(self, user: dict) -> bool:
         if not self.valves.ENABLE_UPDATE_CHECK:
@@ -122,12 +253,16 @@ class Tools:
         if not isinstance(user, dict) or user.get("role") != "admin":
             return False
 
-        time_since_check = datetime.now() - self.update_state["last_check"]
-        return time_since_check >= timedelta(hours=24)
+        return time.monotonic() - self._last_check_monotonic >= 86400
+
+    def _clear_update_task(self, task: asyncio.Task):
+        self._update_task = None
 
     async def _check_and_notify_updates(self, user: dict, event_emitter):
-        if self._should_check_for_updates(user):
-            self._check_github_release()
+        # Check runs in the background, its result is shown on a later call
+        if self._update_task is None and self._should_check_for_updates(user):
+            self._update_task = asyncio.create_task(self._check_github_release())
+            self._update_task.add_done_callback(self._clear_update_task)
 
         if not self.update_state["has_shown_notification"] and event_emitter:
             notification = self._get_update_notification()
@@ -136,93 +271,145 @@ class Tools:
                     {"type": "message", "data": {"content": notification}}
                 )
                 self.update_state["has_shown_notification"] = True
+                self._state_dirty = True
                 self._save_state()
 
     # TOOL
 
-    def _fetch_rates(self) -> Dict[str, Any]:
-        """Fetch currency rates with caching"""
-        current_time = time.time()
-
-        # Check if cache is still valid
-        if (
-            self.cache["data"] is not None
-            and current_time - self.cache["timestamp"] < self.valves.CACHE_DURATION
-        ):
-            return self.cache["data"]
-
-        # Fetch new data
-        try:
-            response = requests.get(self.valves.API_URL, timeout=10)
+    async def _download_rates(self) -> Dict[str, Any]:
+        """Download fresh rates and store them in the cache"""
+        self._last_refresh_attempt = time.monotonic()
+        url = self.valves.API_URL
+
+        # Conditional GET: let the CDN answer 304 if our copy is still current
+        headers = {}
+        if self.cache["data"] is not None and self.cache["url"] == url:
+            if self.cache["etag"]:
+                headers["If-None-Match"] = self.cache["etag"]
+            if self.cache["last_modified"]:
+                headers["If-Modified-Since"] = self.cache["last_modified"]
+
+        async with self._get_session().get(
+            url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            if response.status == 304 and headers:
+                self.cache["timestamp"] = time.monotonic()
+                return self.cache["data"]
             response.raise_for_status()
-            data = response.json()
-
-            # Update cache
-            self.cache["data"] = data
-            self.cache["timestamp"] = current_time
-
+            data = orjson.loads(await response.read())
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        # Update cache
+        self.cache["data"] = data
+        self.cache["timestamp"] = time.monotonic()
+        self.cache["update_time"] = self._format_update_time(data.get("updated", ""))
+        self.cache["listing"] = self._build_listing(data)
+        self.cache["url"] = url
+        self.cache["etag"] = etag
+        self.cache["last_modified"] = last_modified
+
+        return data
+
+    def _clear_inflight(self, task: asyncio.Task):
+        if self._inflight is task:
+            self._inflight = None
+
+    async def _refresh_rates(self) -> Dict[str, Any]:
+        """Refresh rates, sharing one download between concurrent callers"""
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._download_rates())
+            self._inflight.add_done_callback(self._clear_inflight)
+        # Shield so one cancelled caller doesn't abort the shared download
+        return await asyncio.shield(self._inflight)
+
+    async def _background_refresh(self):
+        try:
+            await self._refresh_rates()
+        except Exception:
+            # Keep serving the stale copy, next call will retry
+            pass
+        finally:
+            self._refresh_task = None
+
+    async def _fetch_rates(self) -> Dict[str, Any]:
+        """Fetch currency rates with caching (stale-while-revalidate)"""
+        current_time = time.monotonic()
+        data = self.cache["data"]
+
+        # Serve cached data immediately, refresh in the background when stale
+        if data is not None:
+            if (
+                current_time - self.cache["timestamp"] >= self.valves.CACHE_DURATION
+                and self._refresh_task is None
+                and current_time - self._last_refresh_attempt
+                >= self._min_refresh_interval
+            ):
+                self._refresh_task = asyncio.create_task(self._background_refresh())
             return data
+
+        # Nothing cached yet, the caller has to wait for the first fetch
+        try:
+            return await self._refresh_rates()
         except Exception as e:
-            # If fetch fails but we have cached data, return it
-            if self.cache["data"] is not None:
-                return self.cache["data"]
             raise Exception(f"Failed to fetch currency rates: {str(e)}")
 
+    def _build_listing(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Pre-render the list_currencies sections for a rates payload"""
+        rates = data.get("rates", {})
+        all_currencies = [data.get("base", "USD")] + list(rates.keys())
+
+        # Group currencies
+        crypto_list = [c for c in all_currencies if c in _CRYPTO]
+        fiat_list = [c for c in all_currencies if c not in _CRYPTO]
+
+        crypto_parts: List[str] = []
+        if crypto_list:
+            crypto_parts.append("**🪙 Cryptocurrencies:**\n")
+            for code, line in _CRYPTO_ROWS:
+                if code in crypto_list:
+                    crypto_parts.append(line)
+            crypto_parts.append("\n")
+
+        fiat_parts: List[str] = []
+        if fiat_list:
+            fiat_parts.append("**💵 Fiat Currencies:**\n")
+            # Show in columns
+            for i in range(0, len(fiat_list), 3):
+                row = fiat_list[i : i + 3]
+                fiat_parts.append("• " + ", ".join(sorted(row)) + "\n")
+
+        return {
+            "crypto_count": len(crypto_list),
+            "fiat_count": len(fiat_list),
+            "crypto_text": "".join(crypto_parts),
+            "fiat_text": "".join(fiat_parts),
+        }
+
+    def _format_update_time(self, updated: str) -> str:
+        """Render the payload's update timestamp for display"""
+        if not updated:
+            return ""
+        try:
+            dt = datetime.fromisoformat(updated.replace("Z", "+00:00"))
+            return f"\n🕐 Updated: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}"
+        except (ValueError, TypeError, AttributeError):
+            return ""
+
     def _format_amount(self, amount: float, currency: str) -> str:
         """Format amount based on currency type"""
-        crypto_currencies = ["BTC", "ETH", "SOL"]
-
-        if currency in crypto_currencies:
+        if currency in _CRYPTO:
             # Crypto: use more decimals
-            return f"{amount:,.8f}".rstrip("0").rstrip(".")
-        else:
-            # Fiat: standard 2-4 decimals
-            if amount >= 100:
-                return f"{amount:,.2f}"
-            elif amount >= 1:
-                return f"{amount:,.4f}"
-            else:
-                return f"{amount:,.6f}".rstrip("0").rstrip(".")
+            return _CRYPTO_FMT(amount).rstrip("0").rstrip(".")
+
+        # Fiat: standard 2-4 decimals, small amounts get 6 with zeros trimmed
+        idx = 2 if amount >= 100 else 1 if amount >= 1 else 0
+        text = _FIAT_FMT[idx](amount)
+        return text if idx else text.rstrip("0").rstrip(".")
 
     def _get_currency_name(self, code: str) -> str:
         """Get friendly name for currency code"""
-        names = {
-            "USD": "United States Dollar ($)",
-            "EUR": "Euro (€)",
-            "JPY": "Japanese Yen (¥)",
-            "GBP": "British Pound (£)",
-            "CNY": "Chinese Yuan (¥)",
-            "AUD": "Australian Dollar (A$)",
-            "CAD": "Canadian Dollar (C$)",
-            "CHF": "Swiss Franc (Fr)",
-            "HKD": "Hong Kong Dollar (HK$)",
-            "SGD": "Singapore Dollar (S$)",
-            "NZD": "New Zealand Dollar (NZ$)",
-            "SEK": "Swedish Krona (kr)",
-            "KRW": "South Korean Won (₩)",
-            "NOK": "Norwegian Krone (kr)",
-            "INR": "Indian Rupee (₹)",
-            "MXN": "Mexican Peso ($)",
-            "BRL": "Brazilian Real (R$)",
-            "ZAR": "South African Rand (R)",
-            "TRY": "Turkish Lira (₺)",
-            "DKK": "Danish Krone (kr)",
-            "PLN": "Polish Zloty (zł)",
-            "CZK": "Czech Koruna (Kč)",
-            "ILS": "Israeli New Shekel (₪)",
-            "THB": "Thai Baht (฿)",
-            "MYR": "Malaysian Ringgit (RM)",
-            "PHP": "Philippine Peso (₱)",
-            "IDR": "Indonesian Rupiah (Rp)",
-            "HUF": "Hungarian Forint (Ft)",
-            "RON": "Romanian Leu (lei)",
-            "BGN": "Bulgarian Lev (лв)",
-            "ISK": "Icelandic Króna (kr)",
-            "BTC": "Bitcoin (BTC)",
-            "SOL": "Solana (SOL)",
-            "ETH": "Ethereum (ETH)",
-        }
-        return names.get(code, code)
+        return _CURRENCY_NAMES.get(code, code)
 
     async def convert_currency(
         self,
@@ -254,10 +441,9 @@ class Tools:
         await self._check_and_notify_updates(__user__, __event_emitter__)
         try:
             # Fetch rates
-            data = self._fetch_rates()
+            data = await self._fetch_rates()
             rates = data.get("rates", {})
             base = data.get("base", "USD")
-            updated = data.get("updated", "")
 
             # Normalize currency codes to uppercase
             from_currency = from_currency.upper().strip()
@@ -265,11 +451,11 @@ class Tools:
 
             # Validate currencies exist
             if from_currency not in rates and from_currency != base:
-                available = ", ".join(sorted(rates.keys())[:20])
+                available = ", ".join(heapq.nsmallest(20, rates))
                 return f"❌ Currency '{from_currency}' not found. Available currencies include: {available}..."
 
             if to_currency not in rates and to_currency != base:
-                available = ", ".join(sorted(rates.keys())[:20])
+                available = ", ".join(heapq.nsmallest(20, rates))
                 return f"❌ Currency '{to_currency}' not found. Available currencies include: {available}..."
 
             # Calculate conversion
@@ -277,44 +463,20 @@ class Tools:
             # - Crypto (BTC, ETH, SOL): rates[crypto] = "1 crypto = X USD"
             # - Fiat: rates[fiat] = "1 USD = X fiat"
 
-            crypto_currencies = ["BTC", "ETH", "SOL"]
-            from_is_crypto = from_currency in crypto_currencies
-            to_is_crypto = to_currency in crypto_currencies
-
+            # Convert to base (USD) first, then from base to target
             if from_currency == base:
-                # Converting from USD
-                if to_is_crypto:
-                    # USD to crypto: 1 crypto = rates[crypto] USD
-                    result = amount / rates[to_currency]
-                else:
-                    # USD to fiat: 1 USD = rates[fiat] fiat
-                    result = amount * rates[to_currency]
-
-            elif to_currency == base:
-                # Converting to USD
-                if from_is_crypto:
-                    # Crypto to USD: 1 crypto = rates[crypto] USD
-                    result = amount * rates[from_currency]
-                else:
-                    # Fiat to USD: 1 USD = rates[fiat] fiat
-                    result = amount / rates[from_currency]
-
+                usd_value = amount
+            elif from_currency in _CRYPTO:
+                usd_value = amount * rates[from_currency]
             else:
-                # Converting between two non-USD currencies
-                # First convert to USD, then to target
-                if from_is_crypto:
-                    # Crypto to USD
-                    usd_value = amount * rates[from_currency]
-                else:
-                    # Fiat to USD
-                    usd_value = amount / rates[from_currency]
+                usd_value = amount / rates[from_currency]
 
-                if to_is_crypto:
-                    # USD to crypto
-                    result = usd_value / rates[to_currency]
-                else:
-                    # USD to fiat
-                    result = usd_value * rates[to_currency]
+            if to_currency == base:
+                result = usd_value
+            elif to_currency in _CRYPTO:
+                result = usd_value / rates[to_currency]
+            else:
+                result = usd_value * rates[to_currency]
 
             # Calculate rate: always result/amount for correct display
             rate = result / amount
@@ -326,25 +488,17 @@ class Tools:
             formatted_result = self._format_amount(result, to_currency)
             formatted_rate = self._format_amount(rate, to_currency)
 
-            # Parse update time
-            update_time = ""
-            if updated:
-                try:
-                    dt = datetime.fromisoformat(updated.replace("Z", "+00:00"))
-                    update_time = (
-                        f"\n🕐 Updated: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}"
-                    )
-                except:
-                    pass
+            # Update time is rendered once when the payload is cached
+            update_time = self.cache["update_time"]
 
             # Build response
-            response = f"💱 **Currency Conversion**\n\n"
-            response += f"**{formatted_amount} {from_currency}** ({from_name})\n"
-            response += f"= **{formatted_result} {to_currency}** ({to_name})\n\n"
-            response += f"📊 Rate: 1 {from_currency} = {formatted_rate} {to_currency}"
-            response += update_time
-
-            return response
+            return (
+                f"💱 **Currency Conversion**\n\n"
+                f"**{formatted_amount} {from_currency}** ({from_name})\n"
+                f"= **{formatted_result} {to_currency}** ({to_name})\n\n"
+                f"📊 Rate: 1 {from_currency} = {formatted_rate} {to_currency}"
+                f"{update_time}"
+            )
 
         except Exception as e:
             return f"❌ Error: {str(e)}"
@@ -389,49 +543,29 @@ class Tools:
         """
         await self._check_and_notify_updates(__user__, __event_emitter__)
         try:
-            data = self._fetch_rates()
-            rates = data.get("rates", {})
-            base = data.get("base", "USD")
-
-            crypto = ["BTC", "ETH", "SOL"]
-            all_currencies = [base] + list(rates.keys())
+            await self._fetch_rates()
+            # Sections are pre-rendered whenever the cached payload changes
+            listing = self.cache["listing"]
 
             if filter_type:
                 filter_type = filter_type.lower()
                 if filter_type == "crypto":
-                    currencies = [c for c in all_currencies if c in crypto]
+                    sections = (listing["crypto_text"],)
+                    count = listing["crypto_count"]
                     title = "Cryptocurrencies"
                 elif filter_type == "fiat":
-                    currencies = [c for c in all_currencies if c not in crypto]
+                    sections = (listing["fiat_text"],)
+                    count = listing["fiat_count"]
                     title = "Fiat Currencies"
                 else:
                     return f"❌ Invalid filter type. Use 'crypto', 'fiat', or leave empty for all."
             else:
-                currencies = all_currencies
+                sections = (listing["crypto_text"], listing["fiat_text"])
+                count = listing["crypto_count"] + listing["fiat_count"]
                 title = "All Currencies"
 
             # Build response
-            response = f"💰 **{title}** ({len(currencies)} available)\n\n"
-
-            # Group currencies
-            crypto_list = [c for c in currencies if c in crypto]
-            fiat_list = [c for c in currencies if c not in crypto]
-
-            if crypto_list:
-                response += "**🪙 Cryptocurrencies:**\n"
-                for code in sorted(crypto_list):
-                    name = self._get_currency_name(code)
-                    response += f"• {code} - {name}\n"
-                response += "\n"
-
-            if fiat_list:
-                response += "**💵 Fiat Currencies:**\n"
-                # Show in columns
-                for i in range(0, len(fiat_list), 3):
-                    row = fiat_list[i : i + 3]
-                    response += "• " + ", ".join(sorted(row)) + "\n"
-
-            return response
+            return "".join((f"💰 **{title}** ({count} available)\n\n", *sections))
 
         except Exception as e:
             return f"❌ Error: {str(e)}"